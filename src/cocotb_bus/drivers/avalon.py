@@ -11,12 +11,14 @@ See https://www.intel.com/content/dam/www/programmable/us/en/pdfs/literature/man
 NB Currently we only support a very small subset of functionality
 """
 
+import logging
 import random
+from collections import deque
 from typing import Iterable, Union, Optional
 
 import cocotb
 from cocotb.decorators import coroutine
-from cocotb.triggers import RisingEdge, FallingEdge, ReadOnly, NextTimeStep
+from cocotb.triggers import RisingEdge, FallingEdge, Edge, ReadOnly, NextTimeStep
 from cocotb.utils import hexdump
 from cocotb.binary import BinaryValue
 from cocotb.result import TestError
@@ -24,6 +26,26 @@ from cocotb.result import TestError
 from cocotb_bus.drivers import BusDriver, ValidatedBusDriver
 
 
+# Byte lane mask for every value of an 8-bit slice of byteenable
+_BYTEENABLE_LANES = tuple(
+    sum(0xFF << (8 * i) for i in range(8) if be & (1 << i)) for be in range(256)
+)
+
+
+async def _wait_for_high(signal, clock):
+    """Return in the :class:`~cocotb.triggers.ReadOnly` phase of the first
+    clock cycle in which *signal* is high.
+    """
+    # Avoid spurious object creation by recycling
+    readonly = ReadOnly()
+    clkedge = RisingEdge(clock)
+
+    await readonly
+    while not int(signal.value):
+        await clkedge
+        await readonly
+
+
 class AvalonMM(BusDriver):
     """Avalon Memory Mapped Interface (Avalon-MM) Driver.
 
@@ -44,6 +66,12 @@ class AvalonMM(BusDriver):
         self._can_read = False
         self._can_write = False
 
+        # The set of optional signals is fixed, avoid probing it per transaction
+        self._has_be = hasattr(self.bus, "byteenable")
+        self._has_cs = hasattr(self.bus, "cs")
+        self._has_waitreq = hasattr(self.bus, "waitrequest")
+        self._has_rdv = hasattr(self.bus, "readdatavalid")
+
         # Drive some sensible defaults (setimmediatevalue to avoid x asserts)
         if hasattr(self.bus, "read"):
             self.bus.read.setimmediatevalue(0)
@@ -51,20 +79,24 @@ class AvalonMM(BusDriver):
 
         if hasattr(self.bus, "write"):
             self.bus.write.setimmediatevalue(0)
-            v = self.bus.writedata.value
-            v.binstr = "x" * len(self.bus.writedata)
-            self.bus.writedata.value = v
+            self._wdata_idle = BinaryValue(value="x" * len(self.bus.writedata),
+                                           n_bits=len(self.bus.writedata),
+                                           bigEndian=False)
+            self.bus.writedata.value = self._wdata_idle
             self._can_write = True
 
-        if hasattr(self.bus, "byteenable"):
+        if self._has_be:
             self.bus.byteenable.setimmediatevalue(0)
+            self._be_width = len(self.bus.byteenable)
+            self._be_all_ones = (1 << self._be_width) - 1
 
-        if hasattr(self.bus, "cs"):
+        if self._has_cs:
             self.bus.cs.setimmediatevalue(0)
 
-        v = self.bus.address.value
-        v.binstr = "x" * len(self.bus.address)
-        self.bus.address.setimmediatevalue(v)
+        self._addr_idle = BinaryValue(value="x" * len(self.bus.address),
+                                      n_bits=len(self.bus.address),
+                                      bigEndian=False)
+        self.bus.address.setimmediatevalue(self._addr_idle)
 
     def read(self, address):
         pass
@@ -112,32 +144,26 @@ class AvalonMaster(AvalonMM):
             await RisingEdge(self.clock)
         self.bus.address.value = address
         self.bus.read.value = 1
-        if hasattr(self.bus, "byteenable"):
-            self.bus.byteenable.value = int("1"*len(self.bus.byteenable), 2)
-        if hasattr(self.bus, "cs"):
+        if self._has_be:
+            self.bus.byteenable.value = self._be_all_ones
+        if self._has_cs:
             self.bus.cs.value = 1
 
         # Wait for waitrequest to be low
-        if hasattr(self.bus, "waitrequest"):
+        if self._has_waitreq:
             await self._wait_for_nsignal(self.bus.waitrequest)
         await RisingEdge(self.clock)
 
         # Deassert read
         self.bus.read.value = 0
-        if hasattr(self.bus, "byteenable"):
+        if self._has_be:
             self.bus.byteenable.value = 0
-        if hasattr(self.bus, "cs"):
+        if self._has_cs:
             self.bus.cs.value = 0
-        v = self.bus.address.value
-        v.binstr = "x" * len(self.bus.address)
-        self.bus.address.value = v
-
-        if hasattr(self.bus, "readdatavalid"):
-            while True:
-                await ReadOnly()
-                if int(self.bus.readdatavalid):
-                    break
-                await RisingEdge(self.clock)
+        self.bus.address.value = self._addr_idle
+
+        if self._has_rdv:
+            await _wait_for_high(self.bus.readdatavalid, self.clock)
         else:
             # Assume readLatency = 1 if no readdatavalid
             # FIXME need to configure this,
@@ -173,34 +199,49 @@ class AvalonMaster(AvalonMM):
         self.bus.address.value = address
         self.bus.writedata.value = value
         self.bus.write.value = 1
-        if hasattr(self.bus, "byteenable"):
-            self.bus.byteenable.value = int("1"*len(self.bus.byteenable), 2)
-        if hasattr(self.bus, "cs"):
+        if self._has_be:
+            self.bus.byteenable.value = self._be_all_ones
+        if self._has_cs:
             self.bus.cs.value = 1
 
         # Wait for waitrequest to be low
-        if hasattr(self.bus, "waitrequest"):
+        if self._has_waitreq:
             await self._wait_for_nsignal(self.bus.waitrequest)
 
         # Deassert write
         await RisingEdge(self.clock)
         self.bus.write.value = 0
-        if hasattr(self.bus, "byteenable"):
+        if self._has_be:
             self.bus.byteenable.value = 0
-        if hasattr(self.bus, "cs"):
+        if self._has_cs:
             self.bus.cs.value = 0
-        v = self.bus.address.value
-        v.binstr = "x" * len(self.bus.address)
-        self.bus.address.value = v
-
-        v = self.bus.writedata.value
-        v.binstr = "x" * len(self.bus.writedata)
-        self.bus.writedata.value = v
+        self.bus.address.value = self._addr_idle
+        self.bus.writedata.value = self._wdata_idle
         self._release_lock()
 
 
 class AvalonMemory(BusDriver):
-    """Emulate a memory, with back-door access."""
+    """Emulate a memory, with back-door access.
+
+    Args:
+        entity, name, clock: see :class:`BusDriver`
+        readlatency_min, readlatency_max: range of the random read latency,
+            in clock cycles.
+        memory: backing store, shared with the caller for back-door access.
+            Defaults to a new empty :class:`dict`.
+
+            A :class:`dict` maps byte addresses to data. Single accesses
+            store a whole word at the word's byte address, while bursts
+            store one byte per address. Reading an address that was never
+            written logs a warning and drives X.
+
+            A :class:`bytearray` or writable :class:`memoryview` is a flat,
+            little-endian, byte-addressed buffer starting at address 0.
+            Every address inside the buffer counts as initialised. Writes
+            that do not fit inside the buffer are logged as errors and
+            dropped, and reads there are treated as uninitialised.
+        avl_properties: overrides for :attr:`_avalon_properties`.
+    """
     _signals = ["address"]
     _optional_signals = ["write", "read", "writedata", "readdatavalid",
                          "readdata", "waitrequest", "burstcount", "byteenable"]
@@ -226,11 +267,16 @@ class AvalonMemory(BusDriver):
         if self._avalon_properties["addressUnits"] != "symbols":
             self.log.error("Only symbols addressUnits is supported")
 
+        self._write_burst_waitreq = self._avalon_properties.get("WriteBurstWaitReq", True)
+        self._max_waitreq_len = self._avalon_properties.get("MaxWaitReqLen", 0)
+
         self._burstread = False
         self._burstwrite = False
         self._readable = False
         self._writeable = False
         self._width = None
+        self._has_be = hasattr(self.bus, "byteenable")
+        self._has_rdv = hasattr(self.bus, "readdatavalid")
 
         if hasattr(self.bus, "readdata"):
             self._width = len(self.bus.readdata)
@@ -249,45 +295,57 @@ class AvalonMemory(BusDriver):
         if not self._readable and not self._writeable:
             raise TestError("Attempt to instantiate useless memory")
 
-        # Allow dual port RAMs by referencing the same dictionary
+        # Mask covering all the byte lanes of a data word
+        self._lanes_all = (1 << (8 * (self._width // 8))) - 1
+
+        # Allow dual port RAMs by referencing the same dictionary (or buffer)
         if memory is None:
             self._mem = {}
         else:
             self._mem = memory
+        self._flat = isinstance(self._mem, (bytearray, memoryview))
 
         self._val = BinaryValue(n_bits=self._width, bigEndian=False)
         self._readlatency_min = readlatency_min
         self._readlatency_max = readlatency_max
-        self._responses = []
+        self._latency_fixed = readlatency_min == readlatency_max
+        self._responses = deque()
         self._coro = cocotb.fork(self._respond())
 
-        if hasattr(self.bus, "readdatavalid"):
+        # Drive some sensible defaults (setimmediatevalue to avoid x asserts)
+        if self._has_rdv:
             self.bus.readdatavalid.setimmediatevalue(0)
 
         if hasattr(self.bus, "waitrequest"):
             self.bus.waitrequest.setimmediatevalue(0)
 
+        if self._has_be:
+            self._be_width = len(self.bus.byteenable)
+            self._be_all_ones = (1 << self._be_width) - 1
+            self._be_err_str = "0b" + "1" * self._be_width
+
         if hasattr(self.bus, "burstcount"):
-            if hasattr(self.bus, "readdatavalid"):
+            if self._has_rdv:
                 self._burstread = True
             self._burstwrite = True
-            if self._avalon_properties.get("WriteBurstWaitReq", True):
+            if self._write_burst_waitreq:
                 self.bus.waitrequest.value = 1
             else:
                 self.bus.waitrequest.value = 0
 
-        if hasattr(self.bus, "readdatavalid"):
-            self.bus.readdatavalid.setimmediatevalue(0)
-
     def _pad(self):
         """Pad response queue up to read latency."""
-        l = random.randint(self._readlatency_min, self._readlatency_max)
-        while len(self._responses) < l:
-            self._responses.append(None)
+        if self._latency_fixed:
+            l = self._readlatency_min
+        else:
+            l = random.randint(self._readlatency_min, self._readlatency_max)
+        delta = l - len(self._responses)
+        if delta > 0:
+            self._responses.extend([None] * delta)
 
     def _do_response(self):
         if self._responses:
-            resp = self._responses.pop(0)
+            resp = self._responses.popleft()
         else:
             resp = None
 
@@ -296,14 +354,60 @@ class AvalonMemory(BusDriver):
                 self._val.binstr = "x" * self._width
             else:
                 self._val.integer = resp
-                self.log.debug("sending 0x%x (%s)" %
-                               (self._val.integer, self._val.binstr))
+                if self.log.isEnabledFor(logging.DEBUG):
+                    self.log.debug("sending 0x%x (%s)", resp, self._val.binstr)
             self.bus.readdata.value = self._val
-            if hasattr(self.bus, "readdatavalid"):
+            if self._has_rdv:
                 self.bus.readdatavalid.value = 1
-        elif hasattr(self.bus, "readdatavalid"):
+        elif self._has_rdv:
             self.bus.readdatavalid.value = 0
 
+    def _byteenable_mask(self, byteenable):
+        """Expand *byteenable* into a data mask with the enabled byte lanes set."""
+        mask = 0
+        shift = 0
+        while byteenable:
+            mask |= _BYTEENABLE_LANES[byteenable & 0xFF] << shift
+            byteenable >>= 8
+            shift += 64
+        return mask & self._lanes_all
+
+    def _load(self, byteaddr, burst=False):
+        """Return the word stored at *byteaddr*, or ``None`` if uninitialized.
+
+        In a dictionary memory, single accesses store whole words while burst
+        accesses store one byte per address. A burst only uses the low byte of
+        each entry, so whole words stored by single accesses can be read back.
+        """
+        if self._flat:
+            end = byteaddr + self.dataByteSize
+            if end > len(self._mem):
+                return None
+            return int.from_bytes(self._mem[byteaddr:end], "little")
+        if byteaddr not in self._mem:
+            return None
+        if not burst:
+            return self._mem[byteaddr]
+        return int.from_bytes(
+            bytes(self._mem[a] & 0xFF
+                  for a in range(byteaddr, byteaddr + self.dataByteSize)),
+            "little")
+
+    def _store(self, byteaddr, value, burst=False):
+        """Store the word *value* at *byteaddr*, see :meth:`_load`."""
+        if self._flat:
+            end = byteaddr + self.dataByteSize
+            if end > len(self._mem):
+                self.log.error("Attempt to write outside of memory "
+                               "at address 0x%x", byteaddr)
+                return
+            self._mem[byteaddr:end] = value.to_bytes(self.dataByteSize, "little")
+        elif burst:
+            self._mem.update(zip(range(byteaddr, byteaddr + self.dataByteSize),
+                                 value.to_bytes(self.dataByteSize, "little")))
+        else:
+            self._mem[byteaddr] = value
+
     def _write_burst_addr(self):
         """Reading write burst address, burstcount, byteenable."""
         addr = self.bus.address.value.integer
@@ -313,11 +417,10 @@ class AvalonMemory(BusDriver):
                            ", width = " + str(self._width))
 
         byteenable = self.bus.byteenable.value
-        if byteenable != int("1"*len(self.bus.byteenable), 2):
-            self.log.error("Only full word access is supported " +
-                           "for burst write (byteenable must be " +
-                           "0b" + "1" * len(self.bus.byteenable) +
-                           ")")
+        if byteenable != self._be_all_ones:
+            self.log.error("Only full word access is supported "
+                           "for burst write (byteenable must be %s)",
+                           self._be_err_str)
 
         burstcount = self.bus.burstcount.value.integer
         if burstcount == 0:
@@ -326,20 +429,18 @@ class AvalonMemory(BusDriver):
         return (addr, byteenable, burstcount)
 
     async def _writing_byte_value(self, byteaddr):
-        """Writing value in _mem with byteaddr size."""
+        """Writing value in _mem with byteaddr size, return the value written."""
         await FallingEdge(self.clock)
-        for i in range(self.dataByteSize):
-            data = self.bus.writedata.value.integer
-            addrtmp = byteaddr + i
-            datatmp = (data >> (i*8)) & 0xff
-            self._mem[addrtmp] = datatmp
+        data = self.bus.writedata.value.integer
+        self._store(byteaddr, data, burst=True)
+        return data
 
     async def _waitrequest(self):
         """Generate waitrequest randomly."""
-        if self._avalon_properties.get("WriteBurstWaitReq", True):
-            if random.choice([True, False, False, False]):
-                randmax = self._avalon_properties.get("MaxWaitReqLen", 0)
-                waitingtime = range(random.randint(0, randmax))
+        if self._write_burst_waitreq:
+            # Insert waitrequest cycles one time in four
+            if random.random() < 0.25:
+                waitingtime = range(random.randint(0, self._max_waitreq_len))
                 for waitreq in waitingtime:
                     self.bus.waitrequest.value = 1
                     await RisingEdge(self.clock)
@@ -351,99 +452,104 @@ class AvalonMemory(BusDriver):
     async def _respond(self):
         """Coroutine to respond to the actual requests."""
         edge = RisingEdge(self.clock)
+        readonly = ReadOnly()
+
+        # Bind the signal handles once, the bus doesn't change under us
+        addr_sig = self.bus.address
+        read_sig = self.bus.read if self._readable else None
+        write_sig = self.bus.write if self._writeable else None
+        wd_sig = getattr(self.bus, "writedata", None)
+        bc_sig = getattr(self.bus, "burstcount", None)
+        be_sig = getattr(self.bus, "byteenable", None)
+        wreq_sig = getattr(self.bus, "waitrequest", None)
+
         while True:
             await edge
             self._do_response()
 
-            await ReadOnly()
+            await readonly
 
-            if self._readable and self.bus.read.value:
+            if self._readable and read_sig.value:
                 if not self._burstread:
                     self._pad()
-                    addr = self.bus.address.value.integer
-                    if addr not in self._mem:
+                    addr = addr_sig.value.integer
+                    value = self._load(addr)
+                    if value is None:
                         self.log.warning("Attempt to read from uninitialized "
                                          "address 0x%x", addr)
                         self._responses.append(True)
                     else:
                         self.log.debug("Read from address 0x%x returning 0x%x",
-                                       addr, self._mem[addr])
-                        self._responses.append(self._mem[addr])
+                                       addr, value)
+                        self._responses.append(value)
                 else:
-                    addr = self.bus.address.value.integer
+                    addr = addr_sig.value.integer
                     if addr % self.dataByteSize != 0:
                         self.log.error("Address must be aligned to data width" +
                                        "(addr = " + hex(addr) +
                                        ", width = " + str(self._width))
                     addr = int(addr / self.dataByteSize)
-                    burstcount = self.bus.burstcount.value.integer
-                    byteenable = self.bus.byteenable.value
-                    if byteenable != int("1"*len(self.bus.byteenable), 2):
-                        self.log.error("Only full word access is supported " +
-                                       "for burst read (byteenable must be " +
-                                       "0b" + "1" * len(self.bus.byteenable) +
-                                       ")")
+                    burstcount = bc_sig.value.integer
+                    byteenable = be_sig.value
+                    if byteenable != self._be_all_ones:
+                        self.log.error("Only full word access is supported "
+                                       "for burst read (byteenable must be %s)",
+                                       self._be_err_str)
                     if burstcount == 0:
                         self.log.error("Burstcount must be 1 at least")
 
                     # toggle waitrequest
                     # TODO: configure waitrequest time with Avalon properties
                     await NextTimeStep()  # can't write during read-only phase
-                    self.bus.waitrequest.value = 1
+                    wreq_sig.value = 1
                     await edge
                     await edge
-                    self.bus.waitrequest.value = 0
+                    wreq_sig.value = 0
 
                     # wait for read data
                     for i in range(self._avalon_properties["readLatency"]):
                         await edge
                     for count in range(burstcount):
-                        if (addr + count)*self.dataByteSize not in self._mem:
+                        base = (addr + count) * self.dataByteSize
+                        value = self._load(base, burst=True)
+                        if value is None:
                             self.log.warning("Attempt to burst read from uninitialized "
                                              "address 0x%x (addr 0x%x count 0x%x)",
-                                             (addr + count) * self.dataByteSize, addr, count)
+                                             base, addr, count)
                             self._responses.append(True)
                         else:
-                            value = 0
-                            for i in range(self.dataByteSize):
-                                rvalue = self._mem[(addr + count)*self.dataByteSize + i]
-                                value += rvalue << i*8
                             self.log.debug("Read from address 0x%x returning 0x%x",
-                                           (addr + count) * self.dataByteSize, value)
+                                           base, value)
                             self._responses.append(value)
                         await edge
                         self._do_response()
 
-            if self._writeable and self.bus.write.value:
+            if self._writeable and write_sig.value:
                 if not self._burstwrite:
-                    addr = self.bus.address.value.integer
-                    data = self.bus.writedata.value.integer
-                    if hasattr(self.bus, "byteenable"):
-                        byteenable = int(self.bus.byteenable.value)
-                        mask = 0
-                        oldmask = 0
-                        olddata = 0
-                        if addr in self._mem:
-                            olddata = self._mem[addr]
-                        self.log.debug("Old Data  : %x", olddata)
-                        self.log.debug("Data in   : %x", data)
-                        self.log.debug("Width     : %d", self._width)
-                        self.log.debug("Byteenable: %x", byteenable)
-                        for i in range(self._width//8):
-                            if byteenable & 2**i:
-                                mask |= 0xFF << (8*i)
-                            else:
-                                oldmask |= 0xFF << (8*i)
-
-                        self.log.debug("Data mask : %x", mask)
-                        self.log.debug("Old mask  : %x", oldmask)
-
-                        data = (data & mask) | (olddata & oldmask)
-
-                        self.log.debug("Data out  : %x", data)
+                    addr = addr_sig.value.integer
+                    data = wd_sig.value.integer
+                    if self._has_be:
+                        byteenable = int(be_sig.value)
+                        olddata = self._load(addr)
+                        if olddata is None:
+                            olddata = 0
+                        mask = self._byteenable_mask(byteenable)
+                        oldmask = self._lanes_all ^ mask
+                        newdata = (data & mask) | (olddata & oldmask)
+
+                        if self.log.isEnabledFor(logging.DEBUG):
+                            self.log.debug("Old Data  : %x", olddata)
+                            self.log.debug("Data in   : %x", data)
+                            self.log.debug("Width     : %d", self._width)
+                            self.log.debug("Byteenable: %x", byteenable)
+                            self.log.debug("Data mask : %x", mask)
+                            self.log.debug("Old mask  : %x", oldmask)
+                            self.log.debug("Data out  : %x", newdata)
+
+                        data = newdata
 
                     self.log.debug("Write to address 0x%x -> 0x%x", addr, data)
-                    self._mem[addr] = data
+                    self._store(addr, data)
                 else:
                     self.log.debug("writing burst")
                     # maintain waitrequest high randomly
@@ -452,19 +558,19 @@ class AvalonMemory(BusDriver):
                     addr, byteenable, burstcount = self._write_burst_addr()
 
                     for count in range(burstcount):
-                        while self.bus.write.value == 0:
-                            await NextTimeStep()
+                        # sleep until the master asserts write again
+                        while write_sig.value == 0:
+                            await Edge(write_sig)
                         # self._mem is aligned on 8 bits words
-                        await self._writing_byte_value(addr + count*self.dataByteSize)
+                        data = await self._writing_byte_value(addr + count*self.dataByteSize)
                         self.log.debug("writing %016X @ %08X",
-                                       self.bus.writedata.value.integer,
-                                       addr + count * self.dataByteSize)
+                                       data, addr + count * self.dataByteSize)
                         await edge
                         # generate waitrequest randomly
                         await self._waitrequest()
 
-                    if self._avalon_properties.get("WriteBurstWaitReq", True):
-                        self.bus.waitrequest.value = 1
+                    if self._write_burst_waitreq:
+                        wreq_sig.value = 1
 
 
 class AvalonST(ValidatedBusDriver):
@@ -484,11 +590,12 @@ class AvalonST(ValidatedBusDriver):
             self.config[configoption] = value
             self.log.debug("Setting config option %s to %s", configoption, str(value))
 
-        word = BinaryValue(n_bits=len(self.bus.data), bigEndian=self.config["firstSymbolInHighOrderBits"],
-                           value="x" * len(self.bus.data))
+        self._data_idle = BinaryValue(n_bits=len(self.bus.data), bigEndian=self.config["firstSymbolInHighOrderBits"],
+                                      value="x" * len(self.bus.data))
+        self._word = BinaryValue(n_bits=len(self.bus.data), bigEndian=False)
 
         self.bus.valid.value = 0
-        self.bus.data.value = word
+        self.bus.data.value = self._data_idle
 
     async def _wait_ready(self):
         """Wait for a ready cycle on the bus before continuing.
@@ -512,8 +619,7 @@ class AvalonST(ValidatedBusDriver):
 
         # Avoid spurious object creation by recycling
         clkedge = RisingEdge(self.clock)
-
-        word = BinaryValue(n_bits=len(self.bus.data), bigEndian=False)
+        word = self._word
 
         # Drive some defaults since we don't know what state we're in
         self.bus.valid.value = 0
@@ -546,8 +652,7 @@ class AvalonST(ValidatedBusDriver):
 
         await clkedge
         self.bus.valid.value = 0
-        word.binstr   = "x" * len(self.bus.data)
-        self.bus.data.value = word
+        self.bus.data.value = self._data_idle
 
         self.log.debug("Successfully sent Avalon transmission: %r", value)
 
@@ -579,8 +684,13 @@ class AvalonSTPkts(ValidatedBusDriver):
             self.log.debug("Setting config option %s to %s",
                            configoption, str(value))
 
-        num_data_symbols = (len(self.bus.data) /
-                            self.config["dataBitsPerSymbol"])
+        data_width = len(self.bus.data)
+        symbol_bits = self.config["dataBitsPerSymbol"]
+        if data_width % symbol_bits:
+            raise AttributeError(
+                "%s data width %i is not a multiple of dataBitsPerSymbol %i" %
+                (self.name, data_width, symbol_bits))
+        num_data_symbols = data_width // symbol_bits
         if (num_data_symbols > 1 and not hasattr(self.bus, 'empty')):
             raise AttributeError(
                 "%s has %i data symbols, but contains no object named empty" %
@@ -589,23 +699,25 @@ class AvalonSTPkts(ValidatedBusDriver):
         self.use_empty = (num_data_symbols > 1)
         self.config["useEmpty"] = self.use_empty
 
-        word = BinaryValue(n_bits=len(self.bus.data),
-                           bigEndian=self.config["firstSymbolInHighOrderBits"])
-
-        single = BinaryValue(n_bits=1, bigEndian=False)
+        # Recycled for every word of every packet
+        self._word = BinaryValue(n_bits=len(self.bus.data),
+                                 bigEndian=self.config["firstSymbolInHighOrderBits"])
 
-        word.binstr   = "x" * len(self.bus.data)
-        single.binstr = "x"
+        # Idle values are recycled at the end of every packet
+        self._data_idle = BinaryValue(n_bits=len(self.bus.data),
+                                      bigEndian=self.config["firstSymbolInHighOrderBits"],
+                                      value="x" * len(self.bus.data))
+        self._single_idle = BinaryValue(n_bits=1, bigEndian=False, value="x")
 
         self.bus.valid.value = 0
-        self.bus.data.value = word
-        self.bus.startofpacket.value = single
-        self.bus.endofpacket.value = single
+        self.bus.data.value = self._data_idle
+        self.bus.startofpacket.value = self._single_idle
+        self.bus.endofpacket.value = self._single_idle
 
         if self.use_empty:
-            empty = BinaryValue(n_bits=len(self.bus.empty), bigEndian=False,
-                                value="x" * len(self.bus.empty))
-            self.bus.empty.value = empty
+            self._empty_idle = BinaryValue(n_bits=len(self.bus.empty), bigEndian=False,
+                                           value="x" * len(self.bus.empty))
+            self.bus.empty.value = self._empty_idle
 
         if hasattr(self.bus, 'channel'):
             if len(self.bus.channel) > 128:
@@ -616,9 +728,9 @@ class AvalonSTPkts(ValidatedBusDriver):
                 raise AttributeError("%s has maxChannel=%d, but can only support a maximum channel of "
                                      "(2**channel_width)-1=%d, channel_width=%d" %
                                      (self.name, self.config['maxChannel'], maxChannel, len(self.bus.channel)))
-            channel = BinaryValue(n_bits=len(self.bus.channel), bigEndian=False,
-                                  value="x" * len(self.bus.channel))
-            self.bus.channel.value = channel
+            self._channel_idle = BinaryValue(n_bits=len(self.bus.channel), bigEndian=False,
+                                             value="x" * len(self.bus.channel))
+            self.bus.channel.value = self._channel_idle
 
     async def _wait_ready(self):
         """Wait for a ready cycle on the bus before continuing.
@@ -645,12 +757,13 @@ class AvalonSTPkts(ValidatedBusDriver):
         # bus_width = int(len(self.bus.data) / 8)
         bus_width = int(len(self.bus.data) / self.config["dataBitsPerSymbol"])
 
-        word = BinaryValue(n_bits=len(self.bus.data),
-                           bigEndian=self.config["firstSymbolInHighOrderBits"])
+        # The byte order can be changed between packets through self.config
+        word = self._word
+        word.big_endian = self.config["firstSymbolInHighOrderBits"]
 
-        single = BinaryValue(n_bits=1, bigEndian=False)
-        if self.use_empty:
-            empty = BinaryValue(n_bits=len(self.bus.empty), bigEndian=False)
+        # Slice the packet without copying it for every word
+        view = memoryview(string)
+        pos = 0
 
         # Drive some defaults since we don't know what state we're in
         if self.use_empty:
@@ -666,7 +779,7 @@ class AvalonSTPkts(ValidatedBusDriver):
         elif channel is not None:
             raise TestError("%s does not have a channel signal" % self.name)
 
-        while string:
+        while pos < len(view):
             if not firstword or (firstword and sync):
                 await clkedge
 
@@ -699,17 +812,14 @@ class AvalonSTPkts(ValidatedBusDriver):
             else:
                 self.bus.startofpacket.value = 0
 
-            nbytes = min(len(string), bus_width)
-            data = string[:nbytes]
-            word.buff = data
+            nbytes = min(len(view) - pos, bus_width)
+            word.buff = view[pos:pos + nbytes]
+            pos += nbytes
 
-            if len(string) <= bus_width:
+            if pos == len(view):
                 self.bus.endofpacket.value = 1
                 if self.use_empty:
-                    self.bus.empty.value = bus_width - len(string)
-                string = b""
-            else:
-                string = string[bus_width:]
+                    self.bus.empty.value = bus_width - nbytes
 
             self.bus.data.value = word
 
@@ -721,19 +831,14 @@ class AvalonSTPkts(ValidatedBusDriver):
         await clkedge
         self.bus.valid.value = 0
         self.bus.endofpacket.value = 0
-        word.binstr   = "x" * len(self.bus.data)
-        single.binstr = "x"
-        self.bus.data.value = word
-        self.bus.startofpacket.value = single
-        self.bus.endofpacket.value = single
+        self.bus.data.value = self._data_idle
+        self.bus.startofpacket.value = self._single_idle
+        self.bus.endofpacket.value = self._single_idle
 
         if self.use_empty:
-            empty.binstr = "x" * len(self.bus.empty)
-            self.bus.empty.value = empty
+            self.bus.empty.value = self._empty_idle
         if hasattr(self.bus, 'channel'):
-            channel_value = BinaryValue(n_bits=len(self.bus.channel), bigEndian=False,
-                                        value="x" * len(self.bus.channel))
-            self.bus.channel.value = channel_value
+            self.bus.channel.value = self._channel_idle
 
     async def _send_iterable(self, pkt: Iterable, sync: bool = True) -> None:
         """Args:
@@ -791,7 +896,8 @@ class AvalonSTPkts(ValidatedBusDriver):
         # Avoid spurious object creation by recycling
         if isinstance(pkt, bytes):
             self.log.debug("Sending packet of length %d bytes", len(pkt))
-            self.log.debug(hexdump(pkt))
+            if self.log.isEnabledFor(logging.DEBUG):
+                self.log.debug(hexdump(pkt))
             await self._send_string(pkt, sync=sync, channel=channel)
             self.log.debug("Successfully sent packet of length %d bytes", len(pkt))
         elif isinstance(pkt, str):
@@ -11,7 +11,9 @@ See https://www.intel.com/content/dam/www/programmable/us/en/pdfs/literature/man
 NB Currently we only support a very small subset of functionality.
 """
 
+import logging
 import warnings
+from types import MappingProxyType
 
 from cocotb.utils import hexdump
 from cocotb.triggers import RisingEdge, Event
@@ -33,16 +35,18 @@ class AvalonST(BusMonitor):
     _signals = ["valid", "data"]
     _optional_signals = ["ready"]
 
-    _default_config = {"firstSymbolInHighOrderBits": True}
+    _default_config = MappingProxyType({"firstSymbolInHighOrderBits": True})
 
     def __init__(self, entity, name, clock, *, config={}, **kwargs):
-        BusMonitor.__init__(self, entity, name, clock, **kwargs)
+        # Check before BusMonitor.__init__ starts _monitor_recv
+        unknown = config.keys() - self._default_config.keys()
+        if unknown:
+            raise ValueError(f"{name}: Unknown config options {sorted(unknown)}")
 
-        self.config = self._default_config.copy()
+        BusMonitor.__init__(self, entity, name, clock, **kwargs)
 
-        for configoption, value in config.items():
-            self.config[configoption] = value
-            self.log.debug(f"{self.name}: Setting config option {configoption} to {str(value)}")
+        self.config = {**self._default_config, **config}
+        self.log.debug("%s: Using config %s", self.name, self.config)
 
     async def _monitor_recv(self):
         """Watch the pins and reconstruct transactions."""
@@ -50,18 +54,27 @@ class AvalonST(BusMonitor):
         # Avoid spurious object creation by recycling
         clkedge = RisingEdge(self.clock)
 
-        def valid():
-            if hasattr(self.bus, "ready"):
-                return self.bus.valid.value and self.bus.ready.value  # type: ignore
-            return self.bus.valid.value  # type: ignore
+        # The bus shape is fixed, avoid probing it every cycle
+        has_ready = hasattr(self.bus, "ready")
+        valid_sig = self.bus.valid  # type: ignore
+        data_sig = self.bus.data  # type: ignore
+        ready_sig = self.bus.ready if has_ready else None  # type: ignore
 
-        # NB could await on valid here more efficiently?
+        # Words are packed straight from the integer value
+        byte_width = (len(data_sig) + 7) // 8
+        recv = self._recv
+
+        validedge = RisingEdge(valid_sig)
         while True:
             await clkedge
-            if valid():
-                vec = self.bus.data.value  # type: ignore
-                vec.big_endian = self.config["firstSymbolInHighOrderBits"]
-                self._recv(vec.buff)
+            valid = valid_sig.value
+            if valid and (not has_ready or ready_sig.value):
+                # The byte order can be changed at any time through self.config
+                byteorder = "big" if self.config["firstSymbolInHighOrderBits"] else "little"
+                recv(data_sig.value.integer.to_bytes(byte_width, byteorder))
+            elif not valid:
+                # Sleep through idle stretches rather than polling every clock
+                await validedge
 
 
 class AvalonSTPkts(BusMonitor):
@@ -69,7 +82,9 @@ class AvalonSTPkts(BusMonitor):
 
     Args:
         entity, name, clock: see :class:`BusMonitor`
-        config (dict): bus configuration options
+        config (dict): bus configuration options. ``useEmpty`` is derived
+            from the bus and ignored if given, so the ``config`` of another
+            Avalon-ST packet driver or monitor can be passed in.
         report_channel (bool): report channel with data, default is False
             Setting to True on bus without channel signal will give an error
     """
@@ -77,13 +92,13 @@ class AvalonSTPkts(BusMonitor):
     _signals = ["valid", "data", "startofpacket", "endofpacket"]
     _optional_signals = ["error", "channel", "ready", "empty"]
 
-    _default_config = {
+    _default_config = MappingProxyType({
         "dataBitsPerSymbol": 8,
         "firstSymbolInHighOrderBits": True,
         "maxChannel": 0,
         "readyLatency": 0,
         "invalidTimeout": 0,
-    }
+    })
 
     def __init__(
         self,
@@ -96,45 +111,70 @@ class AvalonSTPkts(BusMonitor):
         error_cb=None,
         **kwargs,
     ):
-        BusMonitor.__init__(self, entity, name, clock, **kwargs)
+        # useEmpty is always recomputed from the bus below
+        config = {key: value for key, value in config.items() if key != "useEmpty"}
 
-        self.config = self._default_config.copy()
-        self.report_channel = report_channel
+        # Check before BusMonitor.__init__ starts _monitor_recv
+        unknown = config.keys() - self._default_config.keys()
+        if unknown:
+            raise ValueError(f"{name}: Unknown config options {sorted(unknown)}")
 
-        # Set default config maxChannel to max value on channel bus
-        if hasattr(self.bus, "channel"):
-            self.config["maxChannel"] = (2 ** len(self.bus.channel)) - 1  # type: ignore
-        else:
-            if report_channel:
-                raise ValueError(
-                    "{self.name}: Channel reporting asked on bus without channel signal"
-                )
+        BusMonitor.__init__(self, entity, name, clock, **kwargs)
 
-        for configoption, value in config.items():
-            self.config[configoption] = value
-            self.log.debug(f"{self.name}: Setting config option {configoption} to {str(value)}")
+        try:
+            self.config = {**self._default_config, **config}
+            self.report_channel = report_channel
 
-        num_data_symbols = len(self.bus.data) / self.config["dataBitsPerSymbol"]  # type: ignore
-        if num_data_symbols > 1 and not hasattr(self.bus, "empty"):
-            raise AttributeError(
-                f"{self.name}: has {num_data_symbols} data symbols, but contains no object named empty"
-            )
+            # Set default config maxChannel to max value on channel bus
+            if hasattr(self.bus, "channel"):
+                if "maxChannel" not in config:
+                    self.config["maxChannel"] = (2 ** len(self.bus.channel)) - 1  # type: ignore
+            else:
+                if report_channel:
+                    raise ValueError(
+                        "{self.name}: Channel reporting asked on bus without channel signal"
+                    )
 
-        self.config["useEmpty"] = num_data_symbols > 1
+            self.log.debug("%s: Using config %s", self.name, self.config)
 
-        if hasattr(self.bus, "channel"):
-            if len(self.bus.channel) > 128:  # type: ignore
+            data_width = len(self.bus.data)  # type: ignore
+            symbol_bits = self.config["dataBitsPerSymbol"]
+            if data_width % symbol_bits:
                 raise AttributeError(
-                    "AvalonST interface specification defines channel width as 1-128. "
-                    f"{self.name}: channel width is {len(self.bus.channel)}"  # type: ignore
+                    f"{self.name}: data width {data_width} is not a multiple of dataBitsPerSymbol {symbol_bits}"
                 )
-            maxChannel = (2 ** len(self.bus.channel)) - 1  # type: ignore
-            if self.config["maxChannel"] > maxChannel:
+            num_data_symbols = data_width // symbol_bits
+            if num_data_symbols > 1 and not hasattr(self.bus, "empty"):
                 raise AttributeError(
-                    f"{self.name}: has maxChannel={self.config['maxChannel']}, but can only support a maximum channel of "
-                    f"(2**channel_width)-1={maxChannel}, channel_width={len(self.bus.channel)}"  # type: ignore
+                    f"{self.name}: has {num_data_symbols} data symbols, but contains no object named empty"
                 )
 
+            self.config["useEmpty"] = num_data_symbols > 1
+
+            if hasattr(self.bus, "channel"):
+                if len(self.bus.channel) > 128:  # type: ignore
+                    raise AttributeError(
+                        "AvalonST interface specification defines channel width as 1-128. "
+                        f"{self.name}: channel width is {len(self.bus.channel)}"  # type: ignore
+                    )
+                maxChannel = (2 ** len(self.bus.channel)) - 1  # type: ignore
+                if self.config["maxChannel"] > maxChannel:
+                    raise AttributeError(
+                        f"{self.name}: has maxChannel={self.config['maxChannel']}, but can only support a maximum channel of "
+                        f"(2**channel_width)-1={maxChannel}, channel_width={len(self.bus.channel)}"  # type: ignore
+                    )
+        except Exception:
+            # Don't leave the _monitor_recv started above running on a
+            # monitor that failed to configure
+            self.kill()
+            raise
+
+        # Deliver packets with or without their channel
+        if report_channel:
+            self._emit = lambda pkt, channel: self._recv({"data": pkt, "channel": channel})
+        else:
+            self._emit = lambda pkt, channel: self._recv(pkt)
+
         self.error_cb = error_cb
         self.in_pkt = Event("in_pkt")
 
@@ -143,35 +183,61 @@ class AvalonSTPkts(BusMonitor):
 
         # Avoid spurious object creation by recycling
         clkedge = RisingEdge(self.clock)
-        pkt = b""
+        # Collect the words of a packet and join them once at end-of-packet
+        pkt_chunks = []
         invalid_cyclecount = 0
         channel = None
 
-        def valid():
-            if hasattr(self.bus, "ready"):
-                return self.bus.valid.value and self.bus.ready.value  # type: ignore
-            return self.bus.valid.value  # type: ignore
-
+        # The bus shape is fixed, avoid probing it every cycle
+        has_ready = hasattr(self.bus, "ready")
+        has_channel = hasattr(self.bus, "channel")
+        has_error = hasattr(self.bus, "error")
+        valid_sig = self.bus.valid  # type: ignore
+        data_sig = self.bus.data  # type: ignore
+        sop_sig = self.bus.startofpacket  # type: ignore
+        eop_sig = self.bus.endofpacket  # type: ignore
+        ready_sig = self.bus.ready if has_ready else None  # type: ignore
+        channel_sig = self.bus.channel if has_channel else None  # type: ignore
+        error_sig = self.bus.error if has_error else None  # type: ignore
+        empty_sig = getattr(self.bus, "empty", None)
+
+        # This coroutine is started from BusMonitor.__init__, before the
+        # attributes it reads below exist, so wait for the first edge.
+        # The config options may be changed between packets, so they are
+        # looked up at each start-of-packet.
+        await clkedge
+        emit = self._emit
+        # Whole words are packed straight from the integer value
+        data_width = len(data_sig)
+        byte_width = (data_width + 7) // 8
+
+        validedge = RisingEdge(valid_sig)
         while True:
-            await clkedge
-
+            valid = valid_sig.value
             if self.in_reset:
                 self.in_pkt.clear()
-                pkt = b""
+                pkt_chunks = []
                 invalid_cyclecount = 0
                 channel = None
-                continue
 
-            if valid():
+            elif valid and (not has_ready or ready_sig.value):
                 invalid_cyclecount = 0
+                eop = eop_sig.value
 
-                if self.bus.startofpacket.value:  # type: ignore
-                    if pkt:
+                if sop_sig.value:
+                    if pkt_chunks:
                         raise AvalonProtocolError(
-                            f"{self.name}: Duplicate start-of-packet received on {str(self.bus.startofpacket)}"  # type: ignore
+                            f"{self.name}: Duplicate start-of-packet received on {str(sop_sig)}"
                         )
-                    pkt = b""
+                    pkt_chunks = []
                     self.in_pkt.set()
+                    config = self.config
+                    first_hi = config["firstSymbolInHighOrderBits"]
+                    use_empty = config["useEmpty"]
+                    max_channel = config["maxChannel"]
+                    invalid_timeout = config["invalidTimeout"]
+                    data_bits = config["dataBitsPerSymbol"]
+                    byteorder = "big" if first_hi else "little"
 
                 if not self.in_pkt.is_set():
                     raise AvalonProtocolError(
@@ -179,70 +245,89 @@ class AvalonSTPkts(BusMonitor):
                     )
 
                 # Handle empty and X's in empty / data
-                vec = BinaryValue()
-                if not self.bus.endofpacket.value:  # type: ignore
-                    vec = self.bus.data.value  # type: ignore
+                if not eop:
+                    pkt_chunks.append(data_sig.value.integer.to_bytes(byte_width, byteorder))
                 else:
-                    value = self.bus.data.value.get_binstr()  # type: ignore
+                    vec = data_sig.value
                     empty = None
-                    if self.config["useEmpty"] and self.bus.empty.value.integer:  # type: ignore
-                        empty = (
-                            self.bus.empty.value.integer  # type: ignore
-                            * self.config["dataBitsPerSymbol"]
-                        )
-                        if self.config["firstSymbolInHighOrderBits"]:
-                            value = value[:-empty]
-                        else:
-                            value = value[empty:]
-                    vec.assign(value)
-                    if not vec.is_resolvable:
-                        raise AvalonProtocolError(
-                            "After empty masking value is still bad?  "
-                            f"{self.name}: Had empty {empty}, got value {self.bus.data.value.get_binstr()}"  # type: ignore
-                        )
-
-                vec.big_endian = self.config["firstSymbolInHighOrderBits"]
-                pkt += vec.buff
+                    empty_syms = empty_sig.value.integer if use_empty else 0
+                    if empty_syms:
+                        empty = empty_syms * data_bits
+                    if vec.is_resolvable:
+                        # Strip the empty symbols from the integer directly
+                        word = vec.integer
+                        kept_bits = data_width
+                        if empty:
+                            kept_bits = max(data_width - empty, 0)
+                            if first_hi:
+                                word >>= empty
+                            else:
+                                word &= (1 << kept_bits) - 1
+                        pkt_chunks.append(word.to_bytes((kept_bits + 7) // 8, byteorder))
+                    else:
+                        # X's are only allowed in the empty symbols
+                        if empty:
+                            value = vec.get_binstr()
+                            if first_hi:
+                                value = value[:-empty]
+                            else:
+                                value = value[empty:]
+                            vec = BinaryValue()
+                            vec.assign(value)
+                        if not vec.is_resolvable:
+                            raise AvalonProtocolError(
+                                "After empty masking value is still bad?  "
+                                f"{self.name}: Had empty {empty}, got value {data_sig.value.get_binstr()}"
+                            )
+                        vec.big_endian = first_hi
+                        pkt_chunks.append(vec.buff)
 
-                if hasattr(self.bus, "channel"):
+                if has_channel:
+                    ch_int = channel_sig.value.integer
                     if channel is None:
-                        channel = self.bus.channel.value.integer  # type: ignore
-                        if channel > self.config["maxChannel"]:
+                        channel = ch_int
+                        if channel > max_channel:
                             raise AvalonProtocolError(
-                                f"{self.name}: Channel value ({self.config['maxChannel']}) is greater than maxChannel"
+                                f"{self.name}: Channel value ({max_channel}) is greater than maxChannel"
                             )
-                    elif self.bus.channel.value.integer != channel:  # type: ignore
+                    elif ch_int != channel:
                         raise AvalonProtocolError(
                             f"{self.name}: Channel value changed during packet"
                         )
 
-                if hasattr(self.bus, "error"):
-                    error_value = self.bus.error.value.integer  # type: ignore
+                if has_error:
+                    error_value = error_sig.value.integer
                     if error_value != 0:
                         self.log.info(f"{self.name}: Received an error {error_value}")
                         if self.error_cb:
                             self.error_cb(error_value)
 
-                if self.bus.endofpacket.value:  # type: ignore
+                if eop:
+                    pkt = b"".join(pkt_chunks)
                     self.log.info(f"{self.name}: Received a packet of {len(pkt)} bytes")
-                    self.log.debug(hexdump(pkt))
+                    if self.log.isEnabledFor(logging.DEBUG):
+                        self.log.debug(hexdump(pkt))
                     self.channel = channel
-                    if self.report_channel:
-                        self._recv({"data": pkt, "channel": channel})
-                    else:
-                        self._recv(pkt)
-                    pkt = b""
+                    emit(pkt, channel)
+                    pkt_chunks = []
                     self.in_pkt.clear()
                     channel = None
             else:
                 if self.in_pkt.is_set():
                     invalid_cyclecount += 1
-                    if self.config["invalidTimeout"]:
-                        if invalid_cyclecount >= self.config["invalidTimeout"]:
+                    if invalid_timeout:
+                        if invalid_cyclecount >= invalid_timeout:
                             raise AvalonProtocolError(
                                 f"{self.name}: In-Packet Timeout. Didn't receive any valid data for {invalid_cyclecount} cycles!"
                             )
 
+            # Sleep through idle stretches between packets rather than polling
+            # every clock. Inside a packet keep sampling each cycle, so that a
+            # reset or the in-packet timeout is still seen.
+            if not valid and not self.in_pkt.is_set():
+                await validedge
+            await clkedge
+
 
 class AvalonSTPktsWithChannel(AvalonSTPkts):
     """Packetized AvalonST bus using channel.
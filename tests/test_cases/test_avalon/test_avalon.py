@@ -41,14 +41,16 @@ from cocotb_bus.drivers.avalon import AvalonMemory
 class BurstAvlReadTest(object):
     """ class to test avalon burst """
 
-    def __init__(self, dut, avlproperties={}):
+    def __init__(self, dut, avlproperties={}, memory=None):
         self.dut = dut
         # Launch clock
         dut.reset.value = 1
         clk_gen = cocotb.fork(Clock(dut.clk, 10).start())
 
         # Bytes aligned memory
-        self.memdict = {value: value for value in range(0x1000)}
+        if memory is None:
+            memory = {value: value for value in range(0x1000)}
+        self.memdict = memory
 
         self.avl32 = AvalonMemory(dut, "master", dut.clk,
                                   memory=self.memdict,
@@ -66,14 +68,21 @@ class BurstAvlReadTest(object):
         self.dut.control_go.value = 0
         self.dut.master_waitrequest.value = 0
 
+    def expected(self, address):
+        """ Value stored at address, None if uninitialized """
+        if isinstance(self.memdict, dict):
+            return self.memdict.get(address, None)
+        if address < len(self.memdict):
+            return self.memdict[address]
+        return None
 
-@cocotb.test()
-async def test_burst_read(dut):
-    """ Testing burst read """
+
+async def run_burst_read(dut, memory=None):
+    """ Burst read from memory and check the values read """
     wordburstcount = 16
     address = 10*wordburstcount
 
-    bart = BurstAvlReadTest(dut, {"readLatency": 10})
+    bart = BurstAvlReadTest(dut, {"readLatency": 10}, memory=memory)
     await bart.init_sig(wordburstcount, address)
     await Timer(100, "ns")
     # Begin master burst read
@@ -104,7 +113,7 @@ async def test_burst_read(dut):
 
     # checking values read
     for key, value in read_mem.items():
-        memdictvalue = bart.memdict.get(key, None)
+        memdictvalue = bart.expected(key)
         if memdictvalue != value:
             if memdictvalue is None:
                 memdictvalue = "Error"
@@ -118,3 +127,15 @@ async def test_burst_read(dut):
     await Timer(1, "ns")
     dut.user_read_buffer.value = 0
     await Timer(1, "ns")
+
+
+@cocotb.test()
+async def test_burst_read(dut):
+    """ Testing burst read """
+    await run_burst_read(dut)
+
+
+@cocotb.test()
+async def test_burst_read_bytearray(dut):
+    """ Testing burst read from a flat bytearray memory """
+    await run_burst_read(dut, bytearray(value & 0xFF for value in range(0x1000)))
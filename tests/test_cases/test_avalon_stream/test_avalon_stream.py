@@ -8,9 +8,11 @@ import math
 import cocotb
 from cocotb.triggers import RisingEdge
 from cocotb.clock import Clock
+from cocotb.result import TestFailure
 from cocotb_bus.drivers import BitDriver
 from cocotb_bus.drivers.avalon import AvalonST as AvalonSTDriver
 from cocotb_bus.monitors.avalon import AvalonST as AvalonSTMonitor
+from cocotb_bus.monitors.avalon import AvalonSTPkts as AvalonSTPktsMonitor
 from cocotb_bus.scoreboard import Scoreboard
 
 
@@ -99,3 +101,91 @@ async def test_avalon_stream(dut):
         await tb.clkedge
 
     raise tb.scoreboard.result
+
+
+class AvalonSTPktsOnStream(AvalonSTPktsMonitor):
+    """Packet monitor on the plain stream, only used to check construction.
+
+    The design has no packet delimiters so valid stands in for them.
+    """
+    _signals = {"valid": "valid", "data": "data",
+                "startofpacket": "valid", "endofpacket": "valid"}
+
+
+@cocotb.test()
+async def test_avalon_stream_config(dut):
+    """Test that known config options are applied and unknown ones rejected"""
+
+    monitor = AvalonSTMonitor(dut, "aso", dut.clk,
+                              config={"firstSymbolInHighOrderBits": False})
+    monitor.kill()
+    if monitor.config != {"firstSymbolInHighOrderBits": False}:
+        raise TestFailure("Config option was not applied: {}".format(monitor.config))
+    if not AvalonSTMonitor._default_config["firstSymbolInHighOrderBits"]:
+        raise TestFailure("Config option leaked into the class defaults")
+
+    try:
+        AvalonSTMonitor(dut, "aso", dut.clk,
+                        config={"firstSymbolInHighOrderBit": False})
+
+        raise TestFailure("Misspelt config option was accepted by the monitor")
+
+    except ValueError:
+        pass
+
+
+@cocotb.test()
+async def test_avalon_stream_partial_symbol(dut):
+    """Test that a data bus that isn't a whole number of symbols is rejected"""
+
+    monitor = AvalonSTPktsOnStream(dut, "aso", dut.clk,
+                                   config={"dataBitsPerSymbol": 8})
+    monitor.kill()
+    if monitor.config["useEmpty"]:
+        raise TestFailure("Single symbol bus should not use empty")
+
+    # The derived useEmpty option doesn't stop a config from being reused,
+    # as with the config of a packet driver
+    copied = AvalonSTPktsOnStream(dut, "aso", dut.clk,
+                                  config={**monitor.config, "useEmpty": True})
+    copied.kill()
+    if copied.config != monitor.config:
+        raise TestFailure("Copied config was not applied: {}".format(copied.config))
+
+    try:
+        AvalonSTPktsOnStream(dut, "aso", dut.clk,
+                             config={"dataBitsPerSymbol": 16})
+
+        raise TestFailure("8 bit data bus was accepted with 16 bit symbols")
+
+    except AttributeError:
+        pass
+
+
+@cocotb.test()
+async def test_avalon_stream_rejected_config_clocked(dut):
+    """Test that rejected monitors leave nothing running on a live bus"""
+
+    tb = AvalonSTTB(dut)
+    await tb.initialise()
+    dut.aso_ready.value = 1
+
+    for monitor_cls, config, error in [
+            (AvalonSTMonitor, {"firstSymbolInHighOrderBit": False}, ValueError),
+            (AvalonSTPktsOnStream, {"firstSymbolInHighOrderBit": False}, ValueError),
+            (AvalonSTPktsOnStream, {"dataBitsPerSymbol": 16}, AttributeError)]:
+        try:
+            monitor_cls(dut, "aso", dut.clk, config=config)
+
+            raise TestFailure("{} accepted config {}".format(monitor_cls.__name__, config))
+
+        except error:
+            pass
+
+    # Get valid words through so anything left behind would sample them
+    for data in range(5):
+        await tb.send_data(data)
+    for _ in range(10):
+        await tb.clkedge
+
+    raise tb.scoreboard.result